@@ -4,9 +4,7 @@
 # should keep this content at the top.
 # ----------------------------------------------------------------------------
 from ._astropy_init import *
-from banzai.logs import BanzaiLogger
-from lcogt_logging import LCOGTFormatter
-import logging
+from banzai import logs
 
 # ----------------------------------------------------------------------------
 
@@ -23,10 +21,4 @@ if not _ASTROPY_SETUP_:
     from banzai import utils
 __all__ = ['utils']
 
-logging.setLoggerClass(BanzaiLogger)
-logging.captureWarnings(True)
-logger = logging.getLogger('banzai')
-
-handler = logging.StreamHandler(stream=sys.stdout)
-handler.setFormatter(LCOGTFormatter())
-logger.addHandler(handler)
+logs.configure_logging()
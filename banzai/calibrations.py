@@ -1,6 +1,7 @@
 import logging
 import abc
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from astropy.io import fits
@@ -70,9 +71,9 @@ class CalibrationStacker(CalibrationMaker):
 
         master_calibration_filename = make_calibration_name(images[0])
 
+        stacking_tags = {'master_calibration': os.path.basename(master_calibration_filename)}
         for i, image in enumerate(images):
-            logger.debug('Stacking Frames', image=image,
-                         extra_tags={'master_calibration': os.path.basename(master_calibration_filename)})
+            logger.debug('Stacking Frames', image=image, extra_tags=stacking_tags)
             data_stack[:, :, i] = image.data[:, :]
             stack_mask[:, :, i] = image.bpm[:, :]
 
@@ -225,8 +226,26 @@ def create_master_calibration_header(old_header, images):
     return header
 
 
+def read_images(image_path_list, runtime_context):
+    # Reading the frames is I/O bound so we overlap the reads using threads. read_image already catches and logs
+    # any errors so a single bad file does not stop the rest of the set from being read.
+    if len(image_path_list) > 1:
+        n_workers = min(runtime_context.N_READ_WORKERS, len(image_path_list))
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            images = list(executor.map(lambda image_path: _prefetch_and_read_image(image_path, runtime_context),
+                                       image_path_list))
+    else:
+        images = [image_utils.read_image(image_path, runtime_context) for image_path in image_path_list]
+    return [image for image in images if image is not None]
+
+
+def _prefetch_and_read_image(image_path, runtime_context):
+    file_utils.prefetch_file(image_path)
+    return image_utils.read_image(image_path, runtime_context)
+
+
 def run_master_maker(image_path_list, runtime_context, frame_type):
-    images = [image_utils.read_image(image_path, runtime_context) for image_path in image_path_list]
+    images = read_images(image_path_list, runtime_context)
     stage_constructor = import_utils.import_attribute(settings.CALIBRATION_STACKER_STAGE[frame_type.upper()])
     stage_to_run = stage_constructor(runtime_context)
     images = stage_to_run.run(images)
@@ -245,6 +264,7 @@ def process_master_maker(instrument, frame_type, min_date, max_date, runtime_con
                                                             db_address=runtime_context.db_address)
     if len(image_path_list) == 0:
         logger.info("No calibration frames found to stack", extra_tags=extra_tags)
+        return
 
     try:
         run_master_maker(image_path_list, runtime_context, frame_type)
@@ -13,7 +13,6 @@ from banzai.context import Context
 
 app = Celery('banzai')
 app.config_from_object('banzai.celeryconfig')
-app.conf.update(broker_url=os.getenv('REDIS_HOST', 'redis://localhost:6379/0'))
 
 logger = logging.getLogger('banzai')
 
@@ -37,11 +36,12 @@ def schedule_calibration_stacking(site: str, runtime_context: dict, min_date=Non
     if frame_types is None:
         frame_types = runtime_context.CALIBRATION_IMAGE_TYPES
 
+    instruments = dbs.get_instruments_at_site(site=site, db_address=runtime_context.db_address)
+    now = datetime.utcnow().replace(microsecond=0)
     for frame_type in frame_types:
         logger.info('Scheduling stacking', extra_tags={'site': site, 'min_date': min_date, 'max_date': max_date,
                                                        'frame_type': frame_type})
-
-        instruments = dbs.get_instruments_at_site(site=site, db_address=runtime_context.db_address)
+        stack_delay = timedelta(seconds=runtime_context.CALIBRATION_STACK_DELAYS[frame_type.upper()])
         for instrument in instruments:
             logger.info('Checking for scheduled calibration blocks', extra_tags={'site': site, 'min_date': min_date,
                                                                                  'max_date': max_date,
@@ -52,8 +52,6 @@ def schedule_calibration_stacking(site: str, runtime_context: dict, min_date=Non
             if len(blocks_for_calibration) > 0:
                 # block_end should be the latest block end time
                 calibration_end_time = max([parse(block['end']) for block in blocks_for_calibration]).replace(tzinfo=None)
-                stack_delay = timedelta(seconds=runtime_context.CALIBRATION_STACK_DELAYS[frame_type.upper()])
-                now = datetime.utcnow().replace(microsecond=0)
                 message_delay = calibration_end_time - now + stack_delay
                 if message_delay.days < 0:
                     message_delay_in_seconds = 0  # Remove delay if block end is in the past
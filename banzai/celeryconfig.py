@@ -1,4 +1,27 @@
-broker_url = 'redis://localhost:6379/0'
+import os
+
+broker_url = os.getenv('REDIS_HOST', 'redis://localhost:6379/0')
+# Acknowledge tasks only after they finish. If a whole worker node goes away (e.g. a restart) the tasks it had
+# reserved are still unacked in redis and get redelivered once the visibility timeout expires.
+# We deliberately leave task_reject_on_worker_lost off: when a single pool process dies (segfault, OOM kill) its task
+# is marked as failed rather than requeued, so a frame that crashes the process cannot be retried forever.
+task_acks_late = True
+# Redis redelivers any unacked message after the visibility timeout, and that includes stack_calibrations tasks
+# that are waiting on their countdown (block end + stack delay, which can be hours). The timeout therefore has to be
+# longer than the longest countdown plus the longest stacking run or we would stack the same calibrations twice.
+# The cost is that tasks from a node that died are only redelivered after this long; override it with
+# CELERY_VISIBILITY_TIMEOUT if a deployment schedules with shorter delays.
+broker_transport_options = {'visibility_timeout': int(os.getenv('CELERY_VISIBILITY_TIMEOUT', 6 * 3600))}
 imports = ('banzai.main', 'banzai.celery',)
+# Every task message carries the whole runtime context, so msgpack is faster and more compact than json.
+# Workers accept both, but we keep sending json by default: during a rolling deploy, workers still running the old
+# config only accept json and would reject msgpack messages. Once every worker has this config, switch the senders
+# over by setting CELERY_TASK_SERIALIZER=msgpack.
+task_serializer = os.getenv('CELERY_TASK_SERIALIZER', 'json')
+result_serializer = task_serializer
+accept_content = ['json', 'msgpack']
+worker_concurrency = int(os.getenv('CELERY_CONCURRENCY', os.cpu_count() or 4))
+# Reductions are long running tasks, so only reserve one task per worker process at a time
 worker_prefetch_multiplier = 1
-worker_max_tasks_per_child = 100
+# Keep the worker processes alive between tasks so the import, database and calibration caches get reused
+worker_max_tasks_per_child = int(os.getenv('CELERY_MAX_TASKS_PER_CHILD', 100))
@@ -11,11 +11,13 @@ import os.path
 import logging
 from glob import glob
 import datetime
+import functools
+import threading
 from dateutil.parser import parse
 
 import numpy as np
 import requests
-from sqlalchemy import create_engine, pool, desc, type_coerce, cast
+from sqlalchemy import create_engine, desc, type_coerce, cast
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, CHAR, JSON, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
@@ -32,11 +34,21 @@ _CONFIGDB_ADDRESS = 'http://configdb.lco.gtn/sites/'
 
 INSTRUMENT_STATES_TO_REDUCE = ['SCHEDULABLE', 'STANDBY']
 
+# Only let one thread at a time fall back to repopulating the instrument tables from the configdb
+_POPULATE_INSTRUMENTS_LOCK = threading.Lock()
+
 Base = declarative_base()
 
 logger = logging.getLogger('banzai')
 
 
+@functools.lru_cache(maxsize=None)
+def _get_engine(db_address, process_id):
+    # Reuse one pooled engine per process so we don't reconnect to the database for every query. Engines are
+    # thread safe, but connections must not be shared across a fork, so the process id is part of the cache key.
+    return create_engine(db_address, pool_pre_ping=True, pool_recycle=3600)
+
+
 @contextmanager
 def get_session(db_address=_DEFAULT_DB):
     """
@@ -46,8 +58,7 @@ def get_session(db_address=_DEFAULT_DB):
     -------
     session: SQLAlchemy Database Session
     """
-    # Build a new engine for each session. This makes things thread safe.
-    engine = create_engine(db_address, poolclass=pool.NullPool)
+    engine = _get_engine(db_address, os.getpid())
     Base.metadata.bind = engine
 
     # We don't use autoflush typically. I have run into issues where SQLAlchemy would try to flush
@@ -364,8 +375,13 @@ def get_instrument(header, db_address=_DEFAULT_DB, configdb_address=_CONFIGDB_AD
         instrument = query_for_instrument(db_address, site, camera, name=name, enclosure=None, telescope=None)
     if instrument is None:
         # if instrument is still missing, try repopulating the database from configdb
-        populate_instrument_tables(db_address=db_address, configdb_address=configdb_address)
-        instrument = query_for_instrument(db_address, site, camera, enclosure=enclosure, telescope=telescope)
+        with _POPULATE_INSTRUMENTS_LOCK:
+            # Another thread may have repopulated the tables while we were waiting for the lock
+            instrument = query_for_instrument(db_address, site, camera, enclosure=enclosure, telescope=telescope)
+            if instrument is None:
+                populate_instrument_tables(db_address=db_address, configdb_address=configdb_address)
+                instrument = query_for_instrument(db_address, site, camera, enclosure=enclosure,
+                                                  telescope=telescope)
     if instrument is None:
         msg = 'Instrument is not in the database, Please add it before reducing this data.'
         tags = {'site': site, 'enclosure': enclosure,
@@ -420,6 +436,32 @@ def get_processed_image(path, db_address=_DEFAULT_DB):
     return processed_image
 
 
+def update_processed_image(path, record_attributes, db_address=_DEFAULT_DB):
+    """
+    Update the processed image record of a file in place
+
+    Parameters
+    ----------
+    path : str
+           Path to the file. Only the basename is stored in the database.
+    record_attributes : dict
+                        Column values to set. Values can be SQL expressions,
+                        e.g. ProcessedImage.tries + 1
+    db_address : str
+                 sqlalchemy address to the database
+
+    Notes
+    -----
+    This issues a single UPDATE rather than reading the record and committing it back in a
+    second session. Records that do not exist yet are not created.
+    """
+    filename = os.path.basename(path)
+    with get_session(db_address=db_address) as db_session:
+        db_session.query(ProcessedImage).filter(ProcessedImage.filename == filename).update(record_attributes,
+                                                                                           synchronize_session=False)
+        db_session.commit()
+
+
 def commit_processed_image(processed_image, db_address=_DEFAULT_DB):
     with get_session(db_address=db_address) as db_session:
         db_session.add(processed_image)
@@ -1,4 +1,5 @@
 import os
+import io
 import logging
 import tempfile
 import shutil
@@ -149,15 +150,23 @@ class Image(object):
         hdu_list = self._get_hdu_list()
         base_filename = os.path.basename(filepath).split('.fz')[0]
         with tempfile.TemporaryDirectory() as temp_directory:
-            hdu_list.writeto(os.path.join(temp_directory, base_filename), overwrite=True, output_verify='fix+warn')
-            hdu_list.close()
+            temp_filepath = os.path.join(temp_directory, base_filename)
             if fpack:
+                hdu_list.writeto(temp_filepath, overwrite=True, output_verify='fix+warn')
+                hdu_list.close()
                 if os.path.exists(filepath):
                     os.remove(filepath)
                 command = 'fpack -q 64 {temp_directory}/{basename}'
                 os.system(command.format(temp_directory=temp_directory, basename=base_filename))
-                base_filename += '.fz'
-            shutil.move(os.path.join(temp_directory, base_filename), filepath)
+                temp_filepath += '.fz'
+            else:
+                # Serialize in memory first so astropy's many small writes do not go straight to disk
+                buffer = io.BytesIO()
+                hdu_list.writeto(buffer, output_verify='fix+warn')
+                hdu_list.close()
+                with open(temp_filepath, 'wb') as temp_file:
+                    temp_file.write(buffer.getbuffer())
+            shutil.move(temp_filepath, filepath)
 
     def _get_hdu_list(self):
         image_hdu = fits.PrimaryHDU(self.data.astype(np.float32), header=self.header)
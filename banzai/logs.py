@@ -4,6 +4,8 @@ import traceback
 import sys
 import multiprocessing
 
+from lcogt_logging import LCOGTFormatter
+
 from banzai.utils import date_utils
 
 
@@ -46,6 +48,26 @@ def _image_to_tags(image):
     return tags
 
 
+def configure_logging():
+    """
+    Attach the LCOGT formatted stdout handler to the banzai logger
+
+    Notes
+    -----
+    This is safe to call more than once; the handler is only added the first time so we never
+    end up emitting every record multiple times.
+    """
+    logging.setLoggerClass(BanzaiLogger)
+    logging.captureWarnings(True)
+    logger = logging.getLogger('banzai')
+    if getattr(logger, '_banzai_configured', False):
+        return
+    handler = logging.StreamHandler(stream=sys.stdout)
+    handler.setFormatter(LCOGTFormatter())
+    logger.addHandler(handler)
+    logger._banzai_configured = True
+
+
 def set_log_level(log_level='INFO'):
     root_logger = logging.getLogger('banzai')
     root_logger.setLevel(log_level.upper())
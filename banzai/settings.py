@@ -57,6 +57,10 @@ CALIBRATION_STACK_DELAYS = {'BIAS': 300,
                             'DARK': 300,
                             'SKYFLAT': 300}
 
+# Number of threads to use when reading the frames that go into a master calibration and when reading the
+# headers of a directory of frames to classify them
+N_READ_WORKERS = int(os.getenv('BANZAI_READ_WORKERS', 8))
+
 SINISTRO_IMAGE_TYPES = ['BIAS', 'DARK', 'SKYFLAT', 'EXPOSE', 'STANDARD', 'TRAILED', 'EXPERIMENTAL']
 
 SCHEDULE_STACKING_CRON_ENTRIES = {'coj': {'minute': 30, 'hour': 6},
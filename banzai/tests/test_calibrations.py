@@ -0,0 +1,24 @@
+import mock
+
+from banzai.calibrations import read_images, process_master_maker
+from banzai.tests.utils import FakeContext, FakeInstrument
+
+
+@mock.patch('banzai.calibrations.image_utils.read_image')
+def test_read_images_preserves_order(mock_read_image):
+    mock_read_image.side_effect = lambda image_path, runtime_context: image_path.upper()
+    image_paths = ['a.fits', 'b.fits', 'c.fits', 'd.fits']
+    assert read_images(image_paths, FakeContext()) == ['A.FITS', 'B.FITS', 'C.FITS', 'D.FITS']
+
+
+@mock.patch('banzai.calibrations.image_utils.read_image')
+def test_read_images_skips_frames_that_could_not_be_read(mock_read_image):
+    mock_read_image.side_effect = lambda image_path, runtime_context: None if 'bad' in image_path else image_path
+    assert read_images(['a.fits', 'bad.fits', 'c.fits'], FakeContext()) == ['a.fits', 'c.fits']
+
+
+@mock.patch('banzai.calibrations.run_master_maker')
+@mock.patch('banzai.calibrations.dbs.get_individual_calibration_images', return_value=[])
+def test_process_master_maker_does_nothing_without_frames(mock_get_images, mock_run_master_maker):
+    process_master_maker(FakeInstrument(), 'BIAS', '2019-01-01', '2019-01-02', FakeContext())
+    assert not mock_run_master_maker.called
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import mock
 
@@ -92,3 +95,53 @@ def test_standby_marked_schedulable():
     instrument = dbs.query_for_instrument(db_address='sqlite:///test.db', site='coj', camera='kb98')
     assert instrument.name == 'kb98'
     assert instrument.schedulable == True
+
+
+def test_instrument_updates_are_seen_immediately():
+    instrument = dbs.query_for_instrument(db_address='sqlite:///test.db', site='coj', camera='kb98')
+    new_record = {'site': instrument.site, 'enclosure': instrument.enclosure, 'telescope': instrument.telescope,
+                  'camera': instrument.camera, 'name': instrument.name, 'type': instrument.type, 'schedulable': False}
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        dbs.add_instrument(new_record, db_session)
+    assert not dbs.query_for_instrument(db_address='sqlite:///test.db', site='coj', camera='kb98').schedulable
+    new_record['schedulable'] = True
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        dbs.add_instrument(new_record, db_session)
+    assert dbs.query_for_instrument(db_address='sqlite:///test.db', site='coj', camera='kb98').schedulable
+
+
+def test_update_processed_image():
+    dbs.get_processed_image('/tmp/test_update.fits', db_address='sqlite:///test.db')
+    dbs.update_processed_image('/tmp/test_update.fits', {'tries': dbs.ProcessedImage.tries + 1},
+                               db_address='sqlite:///test.db')
+    dbs.update_processed_image('/tmp/test_update.fits', {'success': True}, db_address='sqlite:///test.db')
+    processed_image = dbs.get_processed_image('/tmp/test_update.fits', db_address='sqlite:///test.db')
+    assert processed_image.tries == 1
+    assert processed_image.success
+
+
+def test_sessions_share_an_engine():
+    with dbs.get_session(db_address='sqlite:///test.db') as first_session:
+        first_engine = first_session.get_bind()
+    with dbs.get_session(db_address='sqlite:///test.db') as second_session:
+        assert second_session.get_bind() is first_engine
+
+
+def test_missing_instrument_only_repopulates_once_across_threads():
+    fake_instrument = object()
+    populated = threading.Event()
+
+    def fake_populate(db_address, configdb_address):
+        time.sleep(0.05)
+        populated.set()
+
+    def fake_query(*args, **kwargs):
+        return fake_instrument if populated.is_set() else None
+
+    header = {'SITEID': 'xyz', 'INSTRUME': 'missing', 'ENCID': 'doma', 'TELID': '1m0a'}
+    with mock.patch('banzai.dbs.query_for_instrument', side_effect=fake_query), \
+            mock.patch('banzai.dbs.populate_instrument_tables', side_effect=fake_populate) as mock_populate:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            instruments = list(executor.map(lambda _: dbs.get_instrument(header), range(8)))
+    assert all(instrument is fake_instrument for instrument in instruments)
+    assert mock_populate.call_count == 1
@@ -0,0 +1,43 @@
+import hashlib
+import os
+
+import mock
+import pytest
+
+from banzai.utils import file_utils
+
+
+def test_get_md5(tmpdir):
+    filename = tmpdir.join('test.fits')
+    contents = b'SIMPLE  =                    T' * 1000
+    filename.write_binary(contents)
+    assert file_utils.get_md5(str(filename)) == hashlib.md5(contents).hexdigest()
+
+
+def test_get_md5_of_empty_file(tmpdir):
+    filename = tmpdir.join('empty.fits')
+    filename.write_binary(b'')
+    assert file_utils.get_md5(str(filename)) == hashlib.md5(b'').hexdigest()
+
+
+@pytest.mark.skipif(not hasattr(os, 'posix_fadvise'), reason='posix_fadvise is not available on this platform')
+@mock.patch('os.posix_fadvise')
+def test_prefetch_file_hints_the_whole_file(mock_fadvise, tmpdir):
+    filename = tmpdir.join('test.fits')
+    filename.write_binary(b'SIMPLE  =                    T')
+    file_utils.prefetch_file(str(filename))
+    assert mock_fadvise.call_count == 1
+    assert mock_fadvise.call_args[0][1:] == (0, 0, os.POSIX_FADV_WILLNEED)
+
+
+@mock.patch('os.posix_fadvise', create=True)
+def test_prefetch_file_ignores_missing_files(mock_fadvise, tmpdir):
+    file_utils.prefetch_file(str(tmpdir.join('missing.fits')))
+    assert not mock_fadvise.called
+
+
+def test_prefetch_file_does_nothing_without_posix_fadvise(monkeypatch, tmpdir):
+    monkeypatch.delattr(os, 'posix_fadvise', raising=False)
+    with mock.patch('os.open') as mock_open:
+        file_utils.prefetch_file(str(tmpdir.join('test.fits')))
+    assert not mock_open.called
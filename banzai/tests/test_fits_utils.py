@@ -1,3 +1,6 @@
+import os
+import mock
+import pytest
 import numpy as np
 from astropy.table import Table
 from astropy.io import fits
@@ -72,3 +75,98 @@ def test_open_image():
         # Read an image with a single extension and a datacube
         # Read an image with multiple sci extensions
         pass
+
+
+def test_read_primary_header_with_fitsio(tmpdir):
+    pytest.importorskip('fitsio')
+    header = fits.Header({'OBSTYPE': 'BIAS', 'RLEVEL': 0, 'SITEID': 'elp'})
+    filename = str(tmpdir.join('test.fits'))
+    fits.PrimaryHDU(np.zeros((10, 10), dtype=np.float32), header=header).writeto(filename)
+    fitsio_header = fits_utils.read_primary_header_with_fitsio(filename)
+    for keyword in header:
+        assert fitsio_header[keyword] == header[keyword]
+
+
+def write_fpacked_image(filename, header):
+    data = np.zeros((10, 10), dtype=np.float32)
+    primary_header = fits.PrimaryHDU(data, header=header).header
+    primary_header['EXTEND'] = True
+    fits.HDUList([fits.PrimaryHDU(), fits.CompImageHDU(data, header=primary_header)]).writeto(filename)
+    return primary_header
+
+
+def test_uncompress_primary_header_matches_funpack(tmpdir):
+    filename = str(tmpdir.join('test.fits.fz'))
+    primary_header = write_fpacked_image(filename, fits.Header({'OBSTYPE': 'BIAS', 'RLEVEL': 0, 'SITEID': 'elp'}))
+    with fits.open(filename, disable_image_compression=True) as hdulist:
+        compressed_header = hdulist[1].header
+    header = fits_utils.uncompress_primary_header(compressed_header)
+    assert list(header.keys()) == ['SIMPLE', 'BITPIX', 'NAXIS', 'NAXIS1', 'NAXIS2', 'EXTEND', 'OBSTYPE', 'RLEVEL',
+                                   'SITEID']
+    for keyword in header:
+        assert header[keyword] == primary_header[keyword]
+
+
+def test_read_primary_header_with_fitsio_of_fpacked_file(tmpdir):
+    pytest.importorskip('fitsio')
+    filename = str(tmpdir.join('test.fits.fz'))
+    primary_header = write_fpacked_image(filename, fits.Header({'OBSTYPE': 'BIAS', 'RLEVEL': 0, 'SITEID': 'elp'}))
+    fitsio_header = fits_utils.read_primary_header_with_fitsio(filename)
+    assert set(fitsio_header.keys()) == set(primary_header.keys())
+    for keyword in primary_header:
+        assert fitsio_header[keyword] == primary_header[keyword]
+
+
+@mock.patch('banzai.utils.fits_utils.logger')
+@mock.patch('banzai.utils.fits_utils.fitsio', None)
+@mock.patch('banzai.utils.fits_utils.FITS_BACKEND', 'fitsio')
+def test_missing_fitsio_falls_back_to_astropy_with_a_warning(mock_logger, tmpdir):
+    filename = str(tmpdir.join('test.fits'))
+    fits.PrimaryHDU(header=fits.Header({'OBSTYPE': 'BIAS'})).writeto(filename)
+    fits_utils._warn_fitsio_unavailable.cache_clear()
+    assert fits_utils.get_primary_header(filename)['OBSTYPE'] == 'BIAS'
+    assert mock_logger.warning.called
+
+
+def test_get_primary_header_is_cached_until_file_changes(tmpdir):
+    filename = str(tmpdir.join('test.fits'))
+    fits.PrimaryHDU(header=fits.Header({'OBSTYPE': 'BIAS'})).writeto(filename)
+    header = fits_utils.get_primary_header(filename)
+    assert header['OBSTYPE'] == 'BIAS'
+    header['OBSTYPE'] = 'DARK'
+    assert fits_utils.get_primary_header(filename)['OBSTYPE'] == 'BIAS'
+
+    fits.PrimaryHDU(header=fits.Header({'OBSTYPE': 'SKYFLAT'})).writeto(filename, overwrite=True)
+    os.utime(filename, (0, 0))
+    assert fits_utils.get_primary_header(filename)['OBSTYPE'] == 'SKYFLAT'
+
+
+def test_open_fits_file_reads_data_into_memory(tmpdir):
+    filename = str(tmpdir.join('test.fits'))
+    sci_data = np.arange(100, dtype=np.float32).reshape(10, 10)
+    table = Table({'x': [1.0, 2.0], 'y': [3.0, 4.0]})
+    hdulist = fits.HDUList([fits.PrimaryHDU(header=fits.Header({'OBSTYPE': 'EXPOSE'})),
+                            fits.ImageHDU(sci_data, name='SCI'),
+                            fits.BinTableHDU(table, name='CAT'),
+                            fits.CompImageHDU(sci_data * 2, name='BPM')])
+    hdulist.writeto(filename)
+
+    hdulist = fits_utils.open_fits_file(filename)
+    assert hdulist[0].header['OBSTYPE'] == 'EXPOSE'
+    assert not isinstance(hdulist['SCI'].data, np.memmap)
+    np.testing.assert_array_equal(hdulist['SCI'].data, sci_data)
+    np.testing.assert_array_equal(hdulist['CAT'].data['y'], table['y'])
+    np.testing.assert_array_equal(hdulist['BPM'].data, sci_data * 2)
+    # The data is ours to modify once the file is closed
+    hdulist['SCI'].data += 1
+    np.testing.assert_array_equal(hdulist['SCI'].data, sci_data + 1)
+
+
+def test_read_primary_header_fast_matches_astropy(tmpdir):
+    filename = str(tmpdir.join('test.fits'))
+    header = fits.Header({'OBSTYPE': 'BIAS', 'RLEVEL': 0, 'EXPTIME': 1.5, 'SITEID': 'elp'})
+    header['COMMENT'] = 'A comment card'
+    hdulist = fits.HDUList([fits.PrimaryHDU(np.zeros((10, 10), dtype=np.float32), header=header),
+                            fits.ImageHDU(np.ones((10, 10), dtype=np.float32), name='SCI')])
+    hdulist.writeto(filename)
+    assert fits_utils.read_primary_header_fast(filename) == fits.getheader(filename, 0)
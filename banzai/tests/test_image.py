@@ -85,3 +85,14 @@ def test_data_table_adds_columns():
     assert np.allclose(data_table['b'], np.arange(2))
     data_table.add_column(np.arange(1, 3), name='c', index=1)
     assert np.allclose(data_table['c'], np.arange(1, 3))
+
+
+def test_writeto_round_trips_data(tmpdir):
+    test_image = FakeImage(nx=11, ny=13, data_tables={})
+    test_image.header = fits.Header({'OBSTYPE': 'BIAS'})
+    filepath = str(tmpdir.join('test.fits'))
+    test_image._writeto(filepath)
+    hdu_list = fits.open(filepath)
+    np.testing.assert_array_equal(hdu_list['SCI'].data, test_image.data)
+    np.testing.assert_array_equal(hdu_list['BPM'].data, test_image.bpm)
+    assert hdu_list['SCI'].header['OBSTYPE'] == 'BIAS'
@@ -1,7 +1,8 @@
+import mock
 import pytest
 
 from banzai.utils import image_utils
-from banzai.tests.utils import FakeImage
+from banzai.tests.utils import FakeImage, FakeContext, FakeInstrument
 
 
 def throws_inhomogeneous_set_exception(image1, image2,  keyword, additional_group_by_attributes=None):
@@ -32,3 +33,43 @@ def test_raises_exception_if_ccdsums_are_different():
 
 def test_raises_exception_if_filters_are_different():
     throws_inhomogeneous_set_exception(FakeImage(filter='w'), FakeImage(filter='V'), 'filter', ['filter'])
+
+
+@mock.patch('banzai.utils.image_utils.dbs.get_instrument')
+@mock.patch('banzai.utils.image_utils.image_can_be_processed')
+@mock.patch('banzai.utils.image_utils.get_primary_header')
+def test_classify_images_reads_each_header_once(mock_header, mock_can_process, mock_instrument):
+    obstypes = {'bias.fits': 'BIAS', 'dark.fits': 'DARK', 'bias2.fits': 'BIAS', 'bad.fits': 'SKYFLAT'}
+    mock_header.side_effect = lambda filename: {'OBSTYPE': obstypes[filename], 'filename': filename}
+    mock_can_process.side_effect = lambda header, context: None if header['filename'] == 'bad.fits' else \
+        FakeInstrument(schedulable=True)
+    classified_images = image_utils.classify_images(list(obstypes.keys()), FakeContext())
+    assert classified_images == {'BIAS': ['bias.fits', 'bias2.fits'], 'DARK': ['dark.fits']}
+    assert mock_header.call_count == len(obstypes)
+    # The instrument returned by image_can_be_processed is reused for the schedulability check
+    assert not mock_instrument.called
+
+
+def test_make_image_path_list_prefers_uncompressed_files(tmpdir):
+    for filename in ['a.fits', 'a.fits.fz', 'b.fits.fz', 'c.txt', '.hidden.fits']:
+        tmpdir.join(filename).write('')
+    image_path_list = image_utils.make_image_path_list(str(tmpdir))
+    assert sorted(image_path_list) == [str(tmpdir.join('a.fits')), str(tmpdir.join('b.fits.fz'))]
+
+
+@mock.patch('banzai.utils.image_utils.dbs.get_instrument')
+def test_reduced_images_are_rejected_before_looking_up_the_instrument(mock_instrument):
+    context = FakeContext()
+    context.LAST_STAGE = {'BIAS': None}
+    assert image_utils.image_can_be_processed({'OBSTYPE': 'BIAS', 'RLEVEL': 91}, context) is None
+    assert not mock_instrument.called
+
+
+@mock.patch('banzai.utils.image_utils.dbs.get_instrument')
+def test_raw_images_that_pass_criteria_can_be_processed(mock_instrument):
+    mock_instrument.return_value = FakeInstrument(schedulable=True)
+    context = FakeContext()
+    context.LAST_STAGE = {'BIAS': None}
+    context.FRAME_SELECTION_CRITERIA = []
+    instrument = image_utils.image_can_be_processed({'OBSTYPE': 'BIAS', 'RLEVEL': '00'}, context)
+    assert instrument is mock_instrument.return_value
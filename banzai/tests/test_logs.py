@@ -1,5 +1,7 @@
+import logging
+
 from banzai.tests.utils import FakeImage
-from banzai.logs import _image_to_tags
+from banzai.logs import _image_to_tags, configure_logging
 
 
 def test_image_to_tags():
@@ -8,3 +10,11 @@ def test_image_to_tags():
     for key, item in tags.items():
         if key not in ['request_num', 'instrument']:
             assert getattr(image, key) == item
+
+
+def test_configure_logging_only_adds_handler_once():
+    logger = logging.getLogger('banzai')
+    n_handlers = len(logger.handlers)
+    configure_logging()
+    configure_logging()
+    assert len(logger.handlers) == n_handlers
@@ -0,0 +1,64 @@
+import multiprocessing
+
+import mock
+
+from banzai import main
+from banzai.context import Context
+
+
+@mock.patch('banzai.main.run')
+@mock.patch('banzai.main.image_utils.classify_images')
+@mock.patch('banzai.main.image_utils.make_image_path_list')
+def test_process_directory_reduces_all_types(mock_path_list, mock_classify, mock_run):
+    mock_classify.return_value = {'BIAS': ['bias.fits'], 'DARK': ['dark.fits']}
+    main.process_directory(Context({}), '/raw')
+    assert sorted(call[0][0] for call in mock_run.call_args_list) == ['bias.fits', 'dark.fits']
+
+
+@mock.patch('banzai.main.process_directory')
+def test_reduce_directory_passes_raw_path_and_workers(mock_process_directory):
+    with mock.patch('sys.argv', ['banzai_reduce_directory', '--raw-path', '/raw', '--n-workers', '3',
+                                 '--db-address', 'sqlite:///test.db']):
+        main.reduce_directory()
+    runtime_context, raw_path = mock_process_directory.call_args[0]
+    assert raw_path == '/raw'
+    assert runtime_context.n_workers == 3
+
+
+@mock.patch('banzai.main.logger')
+@mock.patch('banzai.main.multiprocessing.Pool')
+@mock.patch('banzai.main.run')
+@mock.patch('banzai.main.image_utils.classify_images')
+@mock.patch('banzai.main.image_utils.make_image_path_list')
+def test_process_directory_runs_serially_and_continues_past_failures(mock_path_list, mock_classify, mock_run,
+                                                                    mock_pool, mock_logger):
+    mock_classify.return_value = {'BIAS': ['1.fits', 'bad.fits', '3.fits']}
+
+    def fail_on_bad_frame(image_path, runtime_context):
+        if 'bad' in image_path:
+            raise ValueError('Could not reduce frame')
+    mock_run.side_effect = fail_on_bad_frame
+    main.process_directory(Context({'n_workers': 1}), '/raw')
+    assert [call[0][0] for call in mock_run.call_args_list] == ['1.fits', 'bad.fits', '3.fits']
+    assert not mock_pool.called
+    mock_logger.error.assert_any_call('1 of 3 frames failed to reduce', extra_tags={'raw_path': '/raw'})
+
+
+def record_reduction(image_path, runtime_context):
+    # The pool workers are separate processes, so leave a mark on disk for every frame reduced
+    with open(image_path + '.reduced', 'a') as reduced_file:
+        reduced_file.write('x')
+
+
+# The mocks only reach the pool workers if they are forked, so do not depend on the platform default
+@mock.patch('banzai.main.multiprocessing', multiprocessing.get_context('fork'))
+@mock.patch('banzai.main.run', side_effect=record_reduction)
+@mock.patch('banzai.main.image_utils.classify_images')
+@mock.patch('banzai.main.image_utils.make_image_path_list')
+def test_process_directory_in_parallel_reduces_every_frame_once(mock_path_list, mock_classify, mock_run, tmpdir):
+    image_paths = [str(tmpdir.join('{0}.fits'.format(i))) for i in range(10)]
+    mock_classify.return_value = {'BIAS': image_paths[:5], 'DARK': image_paths[5:]}
+    main.process_directory(Context({'n_workers': 3}), str(tmpdir))
+    for image_path in image_paths:
+        with open(image_path + '.reduced') as reduced_file:
+            assert reduced_file.read() == 'x'
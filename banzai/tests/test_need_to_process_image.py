@@ -1,4 +1,8 @@
+import types
+
 import mock
+import pytest
+
 from banzai.tests.utils import FakeInstrument, FakeContext
 
 from banzai.utils.realtime_utils import need_to_process_image
@@ -8,86 +12,69 @@ md5_hash2 = 'aec5ef355e7e43a59fedc88ac95caed6'
 
 
 class FakeRealtimeImage(object):
+    __slots__ = ('success', 'checksum', 'tries')
+
     def __init__(self, success=False, checksum=md5_hash1, tries=0):
         self.success = success
         self.checksum = checksum
         self.tries = tries
 
 
-@mock.patch('banzai.utils.file_utils.get_md5')
-@mock.patch('banzai.dbs.get_processed_image')
-@mock.patch('banzai.utils.fits_utils.get_primary_header')
-@mock.patch('banzai.dbs.get_instrument')
-@mock.patch('banzai.utils.image_utils.image_can_be_processed')
-def test_no_processing_if_previous_success(mock_can_process, mock_instrument, mock_header, mock_processed, mock_md5):
-    mock_can_process.return_value = True
-    mock_instrument.return_value = FakeInstrument()
-    mock_processed.return_value = FakeRealtimeImage(success=True, checksum=md5_hash1)
-    mock_md5.return_value = md5_hash1
-    assert not need_to_process_image('test.fits', FakeContext())
-
-
-@mock.patch('banzai.dbs.commit_processed_image')
-@mock.patch('banzai.utils.file_utils.get_md5')
-@mock.patch('banzai.dbs.get_processed_image')
-@mock.patch('banzai.utils.fits_utils.get_primary_header')
-@mock.patch('banzai.dbs.get_instrument')
-@mock.patch('banzai.utils.image_utils.image_can_be_processed')
-def test_do_process_if_never_tried(mock_can_process, mock_instrument, mock_header, mock_processed, mock_md5, mock_commit):
-    mock_can_process.return_value = True
-    mock_instrument.return_value = FakeInstrument()
-    mock_processed.return_value = FakeRealtimeImage(success=False, checksum=md5_hash1, tries=0)
-    mock_md5.return_value = md5_hash1
-    assert need_to_process_image('test.fits', FakeContext())
+@pytest.fixture
+def realtime_mocks():
+    with mock.patch('banzai.utils.image_utils.image_can_be_processed', return_value=FakeInstrument()), \
+            mock.patch('banzai.utils.fits_utils.get_primary_header') as mock_header, \
+            mock.patch('banzai.dbs.get_processed_image') as mock_processed, \
+            mock.patch('banzai.utils.file_utils.get_md5', return_value=md5_hash1) as mock_md5, \
+            mock.patch('banzai.dbs.commit_processed_image') as mock_commit:
+        yield types.SimpleNamespace(header=mock_header, processed_image=mock_processed, md5=mock_md5,
+                                    commit=mock_commit)
 
 
-@mock.patch('banzai.dbs.commit_processed_image')
-@mock.patch('banzai.utils.file_utils.get_md5')
-@mock.patch('banzai.dbs.get_processed_image')
-@mock.patch('banzai.utils.fits_utils.get_primary_header')
-@mock.patch('banzai.dbs.get_instrument')
-@mock.patch('banzai.utils.image_utils.image_can_be_processed')
-def test_do_process_if_tries_less_than_max(mock_can_process, mock_instrument, mock_header, mock_processed, mock_md5, mock_commit):
-    mock_can_process.return_value = True
-    mock_instrument.return_value = FakeInstrument()
-    mock_processed.return_value = FakeRealtimeImage(success=False, checksum=md5_hash1, tries=3)
-    mock_md5.return_value = md5_hash1
+@pytest.mark.parametrize('success, tries, expected', [(True, 0, False),   # previous success
+                                                      (False, 0, True),   # never tried
+                                                      (False, 3, True),   # tries less than max
+                                                      (False, 5, False)])  # tries at max
+def test_need_to_process_image(realtime_mocks, success, tries, expected):
+    realtime_mocks.processed_image.return_value = FakeRealtimeImage(success=success, checksum=md5_hash1, tries=tries)
     context = FakeContext()
     context.max_tries = 5
-    assert need_to_process_image('test.fits', context)
-
-
-@mock.patch('banzai.dbs.commit_processed_image')
-@mock.patch('banzai.utils.file_utils.get_md5')
-@mock.patch('banzai.dbs.get_processed_image')
-@mock.patch('banzai.utils.fits_utils.get_primary_header')
-@mock.patch('banzai.dbs.get_instrument')
-@mock.patch('banzai.utils.image_utils.image_can_be_processed')
-def test_no_processing_if_tries_at_max(mock_can_process, mock_instrument, mock_header, mock_processed, mock_md5, mock_commit):
-    mock_can_process.return_value = True
-    mock_instrument.return_value = FakeInstrument()
-    max_tries = 5
-    mock_processed.return_value = FakeRealtimeImage(success=False, checksum=md5_hash1, tries=max_tries)
-    mock_md5.return_value = md5_hash1
-    context = FakeContext()
-    context.max_tries = max_tries
-    assert not need_to_process_image('test.fits', context)
+    assert need_to_process_image('test.fits', context) == expected
+
 
+def test_retrying_does_not_write_the_record(realtime_mocks):
+    realtime_mocks.processed_image.return_value = FakeRealtimeImage(success=False, checksum=md5_hash1, tries=3)
+    assert need_to_process_image('test.fits', FakeContext())
+    # Nothing about the record changed so there is nothing to write back
+    assert not realtime_mocks.commit.called
 
-@mock.patch('banzai.dbs.commit_processed_image')
-@mock.patch('banzai.utils.file_utils.get_md5')
-@mock.patch('banzai.dbs.get_processed_image')
-@mock.patch('banzai.utils.fits_utils.get_primary_header')
-@mock.patch('banzai.dbs.get_instrument')
-@mock.patch('banzai.utils.image_utils.image_can_be_processed')
-def test_do_process_if_new_checksum(mock_can_process, mock_instrument, mock_header, mock_processed, mock_md5, mock_commit):
+
+def test_do_process_if_new_checksum(realtime_mocks):
     # assert that tries and success are reset to 0
     image = FakeRealtimeImage(success=True, checksum=md5_hash1, tries=3)
-    mock_can_process.return_value = True
-    mock_processed.return_value = image
-    mock_md5.return_value = md5_hash2
-    mock_instrument.return_value = FakeInstrument()
+    realtime_mocks.processed_image.return_value = image
+    realtime_mocks.md5.return_value = md5_hash2
     assert need_to_process_image('test.fits', FakeContext())
     assert not image.success
     assert image.tries == 0
     assert image.checksum == md5_hash2
+
+
+def test_unchanged_processed_file_is_only_checked_once(realtime_mocks, tmpdir):
+    realtime_mocks.processed_image.return_value = FakeRealtimeImage(success=True, checksum=md5_hash1)
+    path = tmpdir.join('test.fits')
+    path.write('original')
+    assert not need_to_process_image(str(path), FakeContext())
+    assert not need_to_process_image(str(path), FakeContext())
+    assert realtime_mocks.processed_image.call_count == 1
+
+    path.write('changed on disk')
+    assert not need_to_process_image(str(path), FakeContext())
+    assert realtime_mocks.processed_image.call_count == 2
+
+
+def test_no_processing_if_file_is_empty(realtime_mocks, tmpdir):
+    path = tmpdir.join('test.fits')
+    path.write('')
+    assert not need_to_process_image(str(path), FakeContext())
+    assert not realtime_mocks.header.called
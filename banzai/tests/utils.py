@@ -73,9 +73,10 @@ class FakeContext(object):
         self.db_address = 'sqlite:foo'
         self.ignore_schedulability = False
         self.max_tries = 5
+        self.N_READ_WORKERS = 4
 
     def image_can_be_processed(self, header):
-        return True
+        return FakeInstrument()
 
 
 class FakeStage(Stage):
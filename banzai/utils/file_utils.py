@@ -32,10 +32,29 @@ def make_output_directory(runtime_context, image_config):
     return output_directory
 
 
+def prefetch_file(filepath):
+    """Ask the kernel to start reading a file into the page cache, if posix_fadvise is available"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        file_descriptor = os.open(filepath, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(file_descriptor, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(file_descriptor)
+
+
 def get_md5(filepath):
+    md5 = hashlib.md5()
     with open(filepath, 'rb') as file:
-        md5 = hashlib.md5(file.read()).hexdigest()
-    return md5
+        # Hash in chunks so we never hold a full copy of a large frame in memory
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
 
 
 def instantly_public(proposal_id):
@@ -1,7 +1,8 @@
 import os
+import re
 import tempfile
 import logging
-import copy
+import functools
 
 from banzai import logs
 
@@ -10,8 +11,22 @@ from astropy.io import fits
 from astropy.coordinates import SkyCoord
 from astropy import units
 
+try:
+    import fitsio
+except ImportError:
+    fitsio = None
+
 logger = logging.getLogger('banzai')
 
+# Library used to read headers: either astropy (default) or fitsio if it is installed
+FITS_BACKEND = os.getenv('BANZAI_FITS_BACKEND', 'astropy')
+
+# Binary table and compression keywords that fpack adds and funpack removes again
+_COMPRESSION_KEYWORDS = re.compile(r'^(XTENSION|BITPIX|NAXIS\d*|PCOUNT|GCOUNT|TFIELDS|THEAP|'
+                                   r'T(TYPE|FORM|UNIT|SCAL|ZERO|NULL|DIM|DISP)\d+|'
+                                   r'ZIMAGE|ZCMPTYPE|ZQUANTIZ|ZDITHER0|ZMASKCMP|ZBLANK|ZTILE\d+|ZNAME\d+|ZVAL\d+|'
+                                   r'ZTENSION|ZPCOUNT|ZGCOUNT|CHECKSUM|DATASUM)$')
+
 
 def sanitizeheader(header):
     # Remove the mandatory keywords from a header so it can be copied to a new
@@ -124,20 +139,132 @@ def open_fits_file(filename):
         with tempfile.TemporaryDirectory() as tmpdirname:
             output_filename = os.path.join(tmpdirname, base_filename)
             os.system('funpack -O {0} {1}'.format(output_filename, filename))
-            hdulist = fits.open(output_filename, 'readonly')
-            hdulist_copy = copy.deepcopy(hdulist)
-            hdulist.close()
+            hdulist = _read_hdulist_into_memory(output_filename)
     else:
-        hdulist = fits.open(filename, 'readonly')
-        hdulist_copy = copy.deepcopy(hdulist)
-        hdulist.close()
-    return hdulist_copy
+        hdulist = _read_hdulist_into_memory(filename)
+    return hdulist
+
+
+def _read_hdulist_into_memory(filename):
+    # Read the data straight into memory rather than memory mapping it. The stages modify the data in place and
+    # funpacked files live in a temporary directory, so the arrays cannot stay backed by the file. Loading
+    # everything before closing the file also saves us from deep copying the whole hdulist.
+    hdulist = fits.open(filename, 'readonly', memmap=False, lazy_load_hdus=False)
+    for hdu in hdulist:
+        hdu.data
+    hdulist.close()
+    return hdulist
+
+
+def read_primary_header_with_fitsio(filename):
+    """
+    Read the primary header of a fits file using fitsio
+
+    Parameters
+    ----------
+    filename: str
+              File name/path to open
+
+    Returns
+    -------
+    header: astropy.io.fits.Header
+
+    Notes
+    -----
+    Only the header blocks are read so fpacked files do not need to be decompressed. fpack moves
+    a primary image into the first extension (marked with ZSIMPLE), so we read that header instead
+    and restore the keywords funpack would, so both backends return the same header.
+    """
+    is_compressed = False
+    with fitsio.FITS(filename) as hdulist:
+        fitsio_header = hdulist[0].read_header()
+        if len(hdulist) > 1 and hdulist[1].is_compressed():
+            compressed_header = hdulist[1].read_header()
+            if 'ZSIMPLE' in compressed_header:
+                fitsio_header = compressed_header
+                is_compressed = True
+    header = fits.Header([fits.Card.fromstring(record['card_string']) for record in fitsio_header.records()])
+    if is_compressed:
+        header = uncompress_primary_header(header)
+    return header
+
+
+def uncompress_primary_header(compressed_header):
+    """
+    Convert the header of an fpacked primary image back to the header funpack writes
+
+    Parameters
+    ----------
+    compressed_header: astropy.io.fits.Header
+                       Raw binary table header of the compressed extension
+
+    Returns
+    -------
+    header: astropy.io.fits.Header
+    """
+    header = fits.Header()
+    image_keywords = ['ZSIMPLE', 'ZBITPIX', 'ZNAXIS']
+    image_keywords += ['ZNAXIS{0}'.format(i + 1) for i in range(compressed_header.get('ZNAXIS', 0))]
+    image_keywords += ['ZEXTEND']
+    for keyword in image_keywords:
+        if keyword in compressed_header:
+            header.append((keyword[1:], compressed_header[keyword], compressed_header.comments[keyword]))
+    for card in compressed_header.cards:
+        if card.keyword in image_keywords or _COMPRESSION_KEYWORDS.match(card.keyword):
+            continue
+        if card.keyword == 'EXTNAME' and card.value == 'COMPRESSED_IMAGE':
+            continue
+        if card.keyword in ['ZHECKSUM', 'ZDATASUM']:
+            card = fits.Card(card.keyword[1:], card.value, card.comment)
+        header.append(card)
+    return header
+
+
+def read_primary_header_fast(filename):
+    """
+    Read only the primary header of an uncompressed fits file
+
+    Parameters
+    ----------
+    filename: str
+              File name/path to open
+
+    Returns
+    -------
+    header: astropy.io.fits.Header
+
+    Notes
+    -----
+    This reads the 2880 byte header blocks up to the END card and nothing else, so no data is loaded
+    and no HDUs are indexed. fpacked files have to go through open_fits_file instead.
+    """
+    with open(filename, 'rb') as fits_file:
+        return fits.Header.fromfile(fits_file)
+
+
+@functools.lru_cache(maxsize=256)
+def _read_primary_header(filename, modification_time):
+    # The modification time is only part of the cache key so that files that change on disk are read again
+    if FITS_BACKEND == 'fitsio':
+        if fitsio is not None:
+            return read_primary_header_with_fitsio(filename)
+        _warn_fitsio_unavailable()
+    if os.path.splitext(filename)[1] != '.fz':
+        return read_primary_header_fast(filename)
+    hdulist = open_fits_file(filename)
+    return hdulist[0].header
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_fitsio_unavailable():
+    # Cached so the warning is only logged once per process
+    logger.warning('BANZAI_FITS_BACKEND is set to fitsio but fitsio is not installed. Reading headers with astropy.')
 
 
 def get_primary_header(filename):
     try:
-        hdulist = open_fits_file(filename)
-        return hdulist[0].header
+        # Return a copy so callers cannot modify the cached header
+        return _read_primary_header(filename, os.path.getmtime(filename)).copy()
     except Exception:
         logger.error("Unable to open fits file: {}".format(logs.format_exception()), extra_tags={'filename': filename})
         return None
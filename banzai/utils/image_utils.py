@@ -1,6 +1,7 @@
 import os
 from glob import glob
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from banzai import logs
 from banzai import dbs
@@ -25,36 +26,66 @@ def is_master(header):
     return header.get('ISMASTER', False)
 
 
+def classify_images(image_list, context):
+    """
+    Sort the images that can be processed by their observation type
+
+    Parameters
+    ----------
+    image_list: list of str
+                Full paths to the images to check
+    context: banzai.context.Context
+             Context object with runtime environment info
+
+    Returns
+    -------
+    classified_images: dict
+                       Lists of the image paths that should be processed, keyed by OBSTYPE
+
+    Notes
+    -----
+    Each primary header is only read once, so the result can be used to select several image types.
+    The checks are I/O bound (header reads and database queries) so they are run in a thread pool.
+    """
+    if len(image_list) > 1:
+        with ThreadPoolExecutor(max_workers=min(context.N_READ_WORKERS, len(image_list))) as executor:
+            obstypes = list(executor.map(lambda filename: _get_obstype_to_process(filename, context), image_list))
+    else:
+        obstypes = [_get_obstype_to_process(filename, context) for filename in image_list]
+
+    classified_images = {}
+    for filename, obstype in zip(image_list, obstypes):
+        if obstype is not None:
+            classified_images.setdefault(obstype, []).append(filename)
+    return classified_images
+
+
+def _get_obstype_to_process(filename, context):
+    # Returns the OBSTYPE of the image if it should be processed, None otherwise
+    try:
+        header = get_primary_header(filename)
+        instrument = image_can_be_processed(header, context)
+        if instrument is not None and (context.ignore_schedulability or instrument.schedulable):
+            return get_obstype(header)
+    except Exception:
+        logger.error(logs.format_exception(), extra_tags={'filename': filename})
+    return None
+
+
 def select_images(image_list, image_type, context):
-    images = []
-    for filename in image_list:
-        try:
-            header = get_primary_header(filename)
-            should_process = image_can_be_processed(header, context)
-            should_process &= (image_type is None or get_obstype(header) == image_type)
-            if not context.ignore_schedulability:
-                instrument = dbs.get_instrument(header, db_address=context.db_address)
-                should_process &= instrument.schedulable
-            if should_process:
-                images.append(filename)
-        except Exception:
-            logger.error(logs.format_exception(), extra_tags={'filename': filename})
-    return images
+    classified_images = classify_images(image_list, context)
+    if image_type is not None:
+        return classified_images.get(image_type, [])
+    return [filename for filenames in classified_images.values() for filename in filenames]
 
 
 def make_image_path_list(raw_path):
     if os.path.isdir(raw_path):
-        # return the list of file and a dummy image configuration
-        fits_files = glob(os.path.join(raw_path, '*.fits'))
-        fz_files = glob(os.path.join(raw_path, '*.fits.fz'))
-
-        fz_files_to_remove = []
-        for i, f in enumerate(fz_files):
-            if f[:-3] in fits_files:
-                fz_files_to_remove.append(f)
-
-        for f in fz_files_to_remove:
-            fz_files.remove(f)
+        # Walk the directory once and skip fpacked files that also exist uncompressed
+        filenames = {entry.name for entry in os.scandir(raw_path) if not entry.name.startswith('.')}
+        fits_files = [os.path.join(raw_path, f) for f in filenames if f.endswith('.fits')]
+        fz_files = [os.path.join(raw_path, f) for f in filenames
+                    if f.endswith('.fits.fz') and f[:-3] not in filenames]
         image_path_list = fits_files + fz_files
 
     else:
@@ -67,30 +98,35 @@ def check_image_homogeneity(images, group_by_attributes=None):
     if group_by_attributes is not None:
         attribute_list += group_by_attributes
     for attribute in attribute_list:
-        if len(set([getattr(image, attribute) for image in images])) > 1:
+        # Compare against the first image so we stop at the first mismatch
+        first_value = getattr(images[0], attribute) if images else None
+        if any(getattr(image, attribute) != first_value for image in images[1:]):
             raise InhomogeneousSetException('Images have different {0}s'.format(attribute))
 
 
-# TODO: Ensure NRES images return False
+# TODO: Ensure NRES images return None
 def image_can_be_processed(header, context):
+    # Returns the instrument that took the image if it can be processed, None otherwise,
+    # so callers can check schedulability without looking the instrument up again
     if header is None:
         logger.warning('Header being checked to process image is None')
-        return False
+        return None
     # Short circuit if the instrument is a guider even if they don't exist in configdb
     if not get_obstype(header) in context.LAST_STAGE:
         logger.warning('Image has an obstype that is not supported by banzai.')
-        return False
+        return None
+    # Check the reduction level before going to the database
+    if get_reduction_level(header) != '00':
+        logger.debug('Image has nonzero reduction level')
+        return None
     try:
         instrument = dbs.get_instrument(header, db_address=context.db_address)
     except ValueError:
-        return False
-    passes = instrument_passes_criteria(instrument, context.FRAME_SELECTION_CRITERIA)
-    if not passes:
+        return None
+    if not instrument_passes_criteria(instrument, context.FRAME_SELECTION_CRITERIA):
         logger.debug('Image does not pass reduction criteria')
-    passes &= get_reduction_level(header) == '00'
-    if get_reduction_level(header) != '00':
-        logger.debug('Image has nonzero reduction level')
-    return passes
+        return None
+    return instrument
 
 
 def read_image(filename, runtime_context):
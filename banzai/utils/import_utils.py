@@ -1,7 +1,10 @@
 import importlib
+import functools
 
 
+@functools.lru_cache(maxsize=None)
 def import_attribute(arg: str):
+    # Imports are idempotent so we only need to resolve each dotted path once
     module_name, attribute_name = arg.rsplit('.', 1)
     module = importlib.import_module(module_name)
     return getattr(module, attribute_name)
@@ -1,23 +1,24 @@
 import logging
+import os
 
 from banzai import dbs
 from banzai.utils import fits_utils, image_utils, file_utils
 
 logger = logging.getLogger('banzai')
 
+# Files that we have already decided not to reprocess (they succeeded or ran out of tries), keyed by
+# (path, modification time, size) so that any change to the file on disk invalidates the entry
+_FILES_TO_SKIP = set()
+_MAX_FILES_TO_SKIP = 10000
+
 
 def set_file_as_processed(path, db_address=dbs._DEFAULT_DB):
-    image = dbs.get_processed_image(path, db_address=db_address)
-    if image is not None:
-        image.success = True
-        dbs.commit_processed_image(image, db_address=db_address)
+    dbs.update_processed_image(path, {'success': True}, db_address=db_address)
 
 
 def increment_try_number(path, db_address=dbs._DEFAULT_DB):
-    image = dbs.get_processed_image(path, db_address=db_address)
-    # Otherwise increment the number of tries
-    image.tries += 1
-    dbs.commit_processed_image(image, db_address=db_address)
+    # Do the increment in the database so it is a single round trip
+    dbs.update_processed_image(path, {'tries': dbs.ProcessedImage.tries + 1}, db_address=db_address)
 
 
 def need_to_process_image(path, context):
@@ -43,17 +44,26 @@ def need_to_process_image(path, context):
     """
     logger.info("Checking if file needs to be processed", extra_tags={"filename": path})
 
-    if not (path.endswith('.fits') or path.endswith('.fits.fz')):
+    if not path.endswith(('.fits', '.fits.fz')):
         logger.warning("Filename does not have a .fits extension, stopping reduction", extra_tags={"filename": path})
         return False
 
-    header = fits_utils.get_primary_header(path)
-    if not image_utils.image_can_be_processed(header, context):
+    try:
+        file_stat = os.stat(path)
+        file_key = (path, file_stat.st_mtime_ns, file_stat.st_size)
+    except OSError:
+        file_key = None
+    else:
+        if file_stat.st_size == 0:
+            logger.warning("File is empty, it may still be being written", extra_tags={"filename": path})
+            return False
+    if file_key in _FILES_TO_SKIP:
+        logger.info('File has not changed since it was last checked, skipping', extra_tags={"filename": path})
         return False
 
-    try:
-        instrument = dbs.get_instrument(header, db_address=context.db_address)
-    except ValueError:
+    header = fits_utils.get_primary_header(path)
+    instrument = image_utils.image_can_be_processed(header, context)
+    if instrument is None:
         return False
     if not context.ignore_schedulability and not instrument.schedulable:
         logger.info('Image will not be processed because instrument is not schedulable', extra_tags={"filename": path})
@@ -76,6 +86,11 @@ def need_to_process_image(path, context):
     # Check if we need to try again
     elif image.tries < context.max_tries and not image.success:
         need_to_process = True
-        dbs.commit_processed_image(image, context.db_address)
+
+    elif file_key is not None:
+        # Nothing about this frame will change until the file does, so remember not to check it again
+        if len(_FILES_TO_SKIP) >= _MAX_FILES_TO_SKIP:
+            _FILES_TO_SKIP.clear()
+        _FILES_TO_SKIP.add(file_key)
 
     return need_to_process
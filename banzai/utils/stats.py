@@ -48,7 +48,7 @@ def median(d, axis=None, mask=None):
         output_shape = np.delete(d.shape, axis)
 
         if mask is not None:
-            median_mask = np.rollaxis(mask, axis, len(d.shape)).reshape(ny, nx).astype(np.uint8)
+            median_mask = np.rollaxis(mask, axis, len(d.shape)).reshape(ny, nx)
         else:
             median_mask = np.zeros((ny, nx), dtype=np.uint8)
 
@@ -116,26 +116,29 @@ def sigma_clipped_mean(a, sigma, axis=None, mask=None, fill_value=0.0, inplace=F
 
     # Throw away any values that are N sigma from the median
     sigma_mask = abs_deviation > (sigma * robust_std)
+    del abs_deviation
 
+    # Work in place on the full size arrays to avoid allocating extra copies of the (potentially large) stack
     if mask is not None:
-        sigma_mask = np.logical_or(sigma_mask, mask > 0)
+        np.logical_or(sigma_mask, mask, out=sigma_mask)
     if inplace:
         mean_array = a
     else:
         mean_array = a.copy()
 
-    mean_array[sigma_mask] = 0.0
+    np.putmask(mean_array, sigma_mask, 0)
 
     # Take the sigma clipped mean
     mean_values = mean_array.sum(axis=axis)
 
-    n_good_pixels = np.logical_not(sigma_mask).sum(axis=axis)
     if axis is None:
+        n_good_pixels = sigma_mask.size - np.count_nonzero(sigma_mask)
         if n_good_pixels > 0:
             mean_values /= n_good_pixels
         else:
             mean_values = fill_value
     else:
+        n_good_pixels = sigma_mask.shape[axis] - np.count_nonzero(sigma_mask, axis=axis)
         mean_values[n_good_pixels > 0] /= n_good_pixels[n_good_pixels > 0]
         mean_values[n_good_pixels == 0] = fill_value
 